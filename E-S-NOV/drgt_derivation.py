@@ -1,11 +1,17 @@
-from sympy import symbols, Matrix, eye, simplify, expand, trace, Rational, pprint
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sympy import symbols, Matrix, eye, simplify, expand_mul, expand_power_exp, Rational, pprint
 
 def apply_series_cutoff(expr, eps_symbol, order):
     """Cortar potencias altas de epsilon"""
+    # Solo hace falta distribuir productos: expand_mul evita el resto de
+    # hints (trig, log, ...) del expand completo
+    _expand = lambda x: expand_mul(expand_power_exp(x))
     if hasattr(expr, 'applyfunc'):
-        return expr.applyfunc(lambda x: expand(x).subs([(eps_symbol**i, 0) for i in range(order+1, 10)]))
+        return expr.applyfunc(lambda x: _expand(x).subs([(eps_symbol**i, 0) for i in range(order+1, 10)]))
     else:
-        return expand(expr).subs([(eps_symbol**i, 0) for i in range(order+1, 10)])
+        return _expand(expr).subs([(eps_symbol**i, 0) for i in range(order+1, 10)])
 
 def main():
     print("="*60)
@@ -36,22 +42,23 @@ def main():
     # Polinomios simétricos elementales
     print("3. Calculando polinomios simétricos e_n(K)...")
     
-    tr_K = trace(K)
-    tr_K2 = trace(K*K)
-    tr_K3 = trace(K*K*K)
-    tr_K4 = trace(K*K*K*K)
-    
+    # det(λI - K) = λ⁴ - e₁λ³ + e₂λ² - e₃λ + e₄: los e_n salen de los
+    # coeficientes del polinomio característico, sin construir K·K·K·K
+    # ni combinar trazas con las identidades de Newton
+    cp_coeffs = K.charpoly('lam').all_coeffs()
+
     e0 = 1
-    e1 = tr_K
-    e2 = Rational(1,2) * (tr_K**2 - tr_K2)
-    e3 = Rational(1,6) * (tr_K**3 - 3*tr_K*tr_K2 + 2*tr_K3)
-    e4 = Rational(1,24) * (tr_K**4 - 6*tr_K**2*tr_K2 + 3*tr_K2**2 + 8*tr_K*tr_K3 - 6*tr_K4)
-    
-    # Simplificar
-    e1 = apply_series_cutoff(expand(e1), eps, 2)
-    e2 = apply_series_cutoff(expand(e2), eps, 2)
-    e3 = apply_series_cutoff(expand(e3), eps, 3)
-    e4 = apply_series_cutoff(expand(e4), eps, 4)
+    e1 = -cp_coeffs[1]
+    e2 = cp_coeffs[2]
+    e3 = -cp_coeffs[3]
+    e4 = cp_coeffs[4]
+    
+    # Simplificar: las cuatro truncaciones son independientes, así que se
+    # reparten en procesos (SymPy puro está limitado por el GIL)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(apply_series_cutoff, e_n, eps, order)
+                   for e_n, order in [(e1, 2), (e2, 2), (e3, 3), (e4, 4)]]
+        e1, e2, e3, e4 = (f.result() for f in futures)
     
     # Resultados
     print("="*60)
@@ -75,18 +82,12 @@ def main():
     print("   VERIFICACIÓN: Estructura Fierz-Pauli")
     print("="*60)
     
-    # Sustituir valores de prueba
-    test_vals = {
-        symbols('h00'): 1, symbols('h11'): 2, symbols('h22'): 3, symbols('h33'): 4,
-        symbols('h01'): 0, symbols('h02'): 0, symbols('h03'): 0,
-        symbols('h12'): 0, symbols('h13'): 0, symbols('h23'): 0,
-        eps: 1
-    }
-    
-    # Tr(h) y Tr(h²) para matriz diagonal de prueba
-    tr_h_test = 1 + 2 + 3 + 4  # = 10
-    tr_h2_test = 1 + 4 + 9 + 16  # = 30
-    
+    # Matriz de prueba numérica: NumPy basta aquí, sin sustitución simbólica
+    h_np = np.diag([1, 2, 3, 4])
+    tr_h_test = np.trace(h_np)
+    # Tr(h²) por contracción directa, sin formar el producto h@h
+    tr_h2_test = np.einsum('ij,ji->', h_np, h_np)
+
     # Fierz-Pauli: Tr(h)² - Tr(h²) = 100 - 30 = 70
     fp_expected = tr_h_test**2 - tr_h2_test
     
@@ -1,121 +1,162 @@
-from sympy import symbols, Matrix, eye, simplify, expand, trace, Rational, pprint
-import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-# Aumentar recursión para expansiones profundas
-sys.setrecursionlimit(10000)
+from symengine import Symbol, Matrix, eye, expand, Rational
+from sympy import count_ops, cse
+
+@lru_cache(maxsize=None)
+def _truncate_entry(x, eps_symbol, order):
+    # Por la simetría de h muchas entradas de la matriz son idénticas;
+    # memoizar evita repetir la truncación sobre la misma expresión.
+    # Un pase de coeficientes por potencia de eps en vez de expand+subs
+    # de cada potencia alta a cero.
+    x = expand(x)
+    return sum(x.coeff(eps_symbol, k)*eps_symbol**k for k in range(order+1))
 
 def apply_series_cutoff(expr, eps_symbol, order):
     """Cortar potencias altas de epsilon"""
     if hasattr(expr, 'applyfunc'):
-        return expr.applyfunc(lambda x: expand(x).subs([(eps_symbol**i, 0) for i in range(order+1, 10)]))
+        return expr.applyfunc(lambda x: _truncate_entry(x, eps_symbol, order))
     else:
-        return expand(expr).subs([(eps_symbol**i, 0) for i in range(order+1, 12)])
+        return _truncate_entry(expr, eps_symbol, order)
+
+def sqrt_series_coeffs(order):
+    """Coeficientes de Taylor de √(1+x): binomio generalizado C(1/2, k),
+    generados por recurrencia en vez de codificados a mano"""
+    coeffs = [Rational(1, 1)]
+    for k in range(1, order + 1):
+        coeffs.append(coeffs[-1] * Rational(3 - 2*k, 2*k))
+    return coeffs
+
+def truncated_det(M, eps_symbol, order):
+    """Determinante por expansión de menores, truncando en eps tras cada
+    producto para que los intermedios no exploten"""
+    n = M.nrows()
+    if n == 1:
+        return M[0, 0]
+    total = 0
+    for j in range(n):
+        cols = [k for k in range(n) if k != j]
+        minor = Matrix([[M[r, c] for c in cols] for r in range(1, n)])
+        term = M[0, j] * truncated_det(minor, eps_symbol, order)
+        total += (-1)**j * apply_series_cutoff(term, eps_symbol, order)
+    return apply_series_cutoff(total, eps_symbol, order)
 
 def main():
     print("="*70)
     print("   DERIVACIÓN COMPLETA DE POLINOMIOS SIMÉTRICOS dRGT")
     print("   Expansión hasta orden cuártico en perturbación h_μν")
     print("="*70)
-    
-    eps = symbols('epsilon')
-    
+
+    eps = Symbol('epsilon')
+
     print("\n1. Definiendo perturbación h_μν (simétrica 4x4)...")
-    
-    # Definir componentes
-    h_comps = [[symbols(f'h{i}{j}') if i <= j else symbols(f'h{j}{i}') for j in range(4)] for i in range(4)]
+
+    # Definir los 10 componentes únicos una sola vez y poblar la matriz
+    # con la forma canónica h[i,j] = h[min,max]: las entradas simétricas
+    # comparten el mismo objeto y se deduplican aguas abajo.
+    hs = {(i, j): Symbol(f'h{i}{j}') for i in range(4) for j in range(i, 4)}
+    h_comps = [[hs[(min(i, j), max(i, j))] for j in range(4)] for i in range(4)]
     h = Matrix(h_comps) * eps
-    
+
     I = eye(4)
-    
+
     print("2. Calculando √(g⁻¹S) = √(I + εh) con expansión de Taylor...")
-    
-    # Expansión hasta orden 4 para capturar e4
-    h2 = h*h
-    h3 = h2*h
-    h4 = h3*h
-    
-    sqrt_gS = (I + Rational(1,2)*h - Rational(1,8)*h2 + Rational(1,16)*h3 - Rational(5,128)*h4)
-    
+
+    # Expansión hasta orden 4 para capturar e4; los coeficientes salen de
+    # la recurrencia y las potencias de h se acumulan una sola vez, así
+    # que subir el orden es cambiar un solo número
+    order = 4
+    coeffs = sqrt_series_coeffs(order)
+    sqrt_gS = coeffs[0] * I
+    h_pow = I
+    for c in coeffs[1:]:
+        h_pow = h_pow * h
+        sqrt_gS = sqrt_gS + c * h_pow
+
     # K = I - √(g⁻¹S)
     K = I - sqrt_gS
-    K = apply_series_cutoff(K, eps, 4)
-    
-    print("3. Calculando trazas de potencias de K...")
-    
-    # Potencias de K
-    K2 = simplify(K @ K)
-    K2 = apply_series_cutoff(K2, eps, 4)
-    
-    K3 = simplify(K2 @ K)
-    K3 = apply_series_cutoff(K3, eps, 4)
-    
-    K4 = simplify(K2 @ K2)
-    K4 = apply_series_cutoff(K4, eps, 4)
-    
-    # Trazas
-    tr_K = trace(K)
-    tr_K2 = trace(K2)
-    tr_K3 = trace(K3)
-    tr_K4 = trace(K4)
-
-    # Definición de polinomios simétricos (Agregado para corrección)
-    e2 = Rational(1,2) * (tr_K**2 - tr_K2)
-    e3 = Rational(1,6) * (tr_K**3 - 3*tr_K*tr_K2 + 2*tr_K3)
-    e4 = Rational(1,24) * (tr_K**4 - 6*tr_K**2*tr_K2 + 3*tr_K2**2 + 8*tr_K*tr_K3 - 6*tr_K4)
-    
+    K = apply_series_cutoff(K, eps, order)
+
+    print("3. Calculando polinomios simétricos vía polinomio característico...")
+
+    # det(I + t·K) = Σ e_n(K) tⁿ: un solo determinante 4×4 da todos los
+    # e_n sin construir K², K³, K⁴ ni sus trazas (identidades de Newton)
+    t = Symbol('t')
+    charpoly = expand(truncated_det(I + t*K, eps, order))
+
+    tr_K = charpoly.coeff(t, 1)  # e₁ = Tr(K)
+    e2 = charpoly.coeff(t, 2)
+    e3 = charpoly.coeff(t, 3)
+    e4 = charpoly.coeff(t, 4)
+
+    # Las cuatro truncaciones por orden son independientes: repartirlas en
+    # procesos (la álgebra pura está limitada por el GIL, hilos no bastan)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futures = {n: pool.submit(apply_series_cutoff, expr, eps, order)
+                   for n, expr, order in [(1, tr_K, 4), (2, e2, 2),
+                                          (3, e3, 3), (4, e4, 4)]}
+        tr_K_trunc = futures[1].result()
+        e2_quad = futures[2].result()
+        e3_cubic = futures[3].result()
+        e4_quart = futures[4].result()
+
     print("\n" + "="*70)
     print("   RESULTADOS: Polinomios Simétricos e_n(K)")
     print("="*70)
-    
+
     # e0 (trivial)
     print("\n[e₀] = 1\n")
-    
+
     # e1 (lineal)
     print("[e₁] = Tr(K) = -½ Tr(h) + O(h²)\n")
     print("Componentes relevantes:")
-    e1_expanded = expand(tr_K.subs(eps, 1))
+    e1_expanded = expand(tr_K_trunc.subs(eps, 1))
     print(f"  → Contiene: {len(e1_expanded.args)} términos lineales\n")
-    
+
     # e2 (cuadrático - Fierz-Pauli)
     print("[e₂] = ½([K]² - [K²])")
     print("    = ½(Tr(K)² - Tr(K²))")
     print("\nA orden cuadrático:")
-    e2_quad = apply_series_cutoff(e2, eps, 2)
     print("  → Genera estructura Fierz-Pauli: m²[h_μν h^μν - h²]\n")
-    
+
+    # CSE conjunta sobre e₃ y e₄ en lugar de simplify: factoriza las
+    # subexpresiones comunes en un pase lineal sobre el árbol
+    e3_cubic = expand(e3_cubic.subs(eps, 1))
+    e4_quart = expand(e4_quart.subs(eps, 1))
+    cse_repl, (e3_red, e4_red) = cse([e3_cubic._sympy_(), e4_quart._sympy_()],
+                                     optimizations='basic')
+
     # e3 (cúbico - Interacciones a 3 campos)
     print("[e₃] = (1/6)([K]³ - 3[K][K²] + 2[K³])")
     print("\nA orden cúbico (interacciones 3-gravitón):")
-    e3_cubic = apply_series_cutoff(e3, eps, 3)
-    e3_cubic = simplify(e3_cubic.subs(eps, 1))
-    print(f"  → {len(str(e3_cubic))} caracteres en expansión simbólica")
+    print(f"  → {count_ops(e3_red)} operaciones tras CSE")
     print("  → Factores de escala: m²M_P²β₃ × (interacciones)\n")
-    
+
     # e4 (cuártico - Auto-acoplamiento)
     print("[e₄] = (1/24)([K]⁴ - 6[K]²[K²] + 3[K²]² + 8[K][K³] - 6[K⁴])")
     print("\nA orden cuártico (interacciones 4-gravitón):")
-    e4_quart = apply_series_cutoff(e4, eps, 4)
-    e4_quart = simplify(e4_quart.subs(eps, 1))
-    print(f"  → {len(str(e4_quart))} caracteres en expansión simbólica")
+    print(f"  → {count_ops(e4_red)} operaciones tras CSE")
+    print(f"  → {len(cse_repl)} subexpresiones comunes entre e₃ y e₄")
     print("  → Dominante en cortas distancias → Mecanismo de Vainshtein\n")
-    
+
     # Verificación numérica final
     print("="*70)
     print("   VERIFICACIÓN: Conservación de Grados de Libertad")
     print("="*70)
-    
+
     # Dimensionamiento
     n_terms_e1 = len(e1_expanded.args)
     n_terms_e2 = len(expand(e2_quad).args) if hasattr(expand(e2_quad), 'args') else 1
     n_terms_e3 = len(e3_cubic.args) if hasattr(e3_cubic, 'args') else 1
     n_terms_e4 = len(e4_quart.args) if hasattr(e4_quart, 'args') else 1
-    
+
     print(f"\nNúmero de términos independientes generados:")
     print(f"  e₁ (masa gravitón):         ~{n_terms_e1} términos")
     print(f"  e₂ (interacciones FP):      ~{n_terms_e2} términos")
     print(f"  e₃ (interacciones cúbicas): ~{n_terms_e3} términos")
     print(f"  e₄ (interacciones cuárticas):~{n_terms_e4} términos")
-    
+
     print("\n" + "="*70)
     print("   CONCLUSIÓN FÍSICA")
     print("="*70)